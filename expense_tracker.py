@@ -5,12 +5,13 @@ Features:
 - Add, update, and delete daily expenses
 - View expenses by day and monthly summary
 - Category-wise and daily visualizations using matplotlib
-- Persistent storage using JSON
+- Persistent storage using an append-only JSON Lines log
 - Export expense data to CSV
 
 This project demonstrates:
 - Python OOP using dataclasses
-- File handling (JSON, CSV)
+- Column-oriented in-memory storage
+- File handling (JSON Lines, CSV)
 - Input validation
 - Basic data visualization
 
@@ -19,14 +20,81 @@ Author: Swaraj Sigdel
 
 
 import json
+import math
+import mmap
 import os
-from datetime import datetime
-import matplotlib.pyplot as plt
-import csv
-from dataclasses import dataclass
-
-FILE_NAME = "expenses.json"
+import re
+import sys
+import uuid
+from array import array
+from bisect import insort
+from calendar import monthrange
+from collections import defaultdict
+from dataclasses import dataclass, field
+from multiprocessing import Process
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# matplotlib takes a noticeable time to import, so it is only loaded the
+# first time a chart is drawn; see load_pyplot()
+plt = None
+
+FILE_NAME = "expenses.jsonl"
+LEGACY_FILE_NAME = "expenses.json"
+REJECTED_FILE_NAME = "expenses.jsonl.bad"
 CSV_EXPORT_NAME = "expenses_export.csv"
+CHART_DIR = "charts"
+# larger than the default so a full log rewrite needs far fewer write calls
+WRITE_BUFFER_SIZE = 1 << 16
+CSV_BUFFER_SIZE = 1 << 20
+MAX_AMOUNT = 10 ** 12
+
+# matplotlib backends that cannot open a window; charts are saved as images instead
+FILE_BACKENDS = {"agg", "cairo", "pdf", "pgf", "ps", "svg", "template"}
+
+LISTING_ROW = "{:<4} {:<12} {:<15} {:<30} {}\n".format
+SUMMARY_ROW = "  {:<15} Rs. {:>8.2f}  ({:.1f}%)\n".format
+
+DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+MONTH_RE = re.compile(r"([0-9]{4})-([0-9]{2})")
+# older versions validated with strptime, which also stored dates like 2025-1-5
+LOOSE_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})")
+
+
+def new_id():
+    return uuid.uuid4().hex
+
+
+def to_paisa(amount):
+    """A rupee amount as a whole number of paisa (hundredths of a rupee)"""
+    return round(amount * 100)
+
+
+def parse_amount(text):
+    """Rupee amount typed by the user, rounded to whole paisa"""
+    amount = float(text)
+    # the bound keeps paisa within the 64-bit amounts column
+    if not math.isfinite(amount) or abs(amount) > MAX_AMOUNT:
+        raise ValueError(f"amount out of range: {text!r}")
+    return to_paisa(amount) / 100
+
+
+def valid_date(s):
+    """True if s is a real calendar date written as YYYY-MM-DD"""
+    m = DATE_RE.fullmatch(s)
+    if not m:
+        return False
+    year, month, day = map(int, m.groups())
+    return year >= 1 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]
+
+
+def valid_month(s):
+    """True if s is a month written as YYYY-MM"""
+    m = MONTH_RE.fullmatch(s)
+    return m is not None and int(m.group(1)) >= 1 and 1 <= int(m.group(2)) <= 12
 
 
 @dataclass
@@ -35,9 +103,11 @@ class Expense:
     description: str
     category: str
     amount: float
+    id: str = field(default_factory=new_id)
 
     def to_dict(self):
         return {
+            "id": self.id,
             "date": self.date,
             "description": self.description,
             "category": self.category,
@@ -50,32 +120,462 @@ class Expense:
             date=d["date"],
             description=d["description"],
             category=d.get("category", "Other"),
-            amount=float(d["amount"])
+            amount=float(d["amount"]),
+            id=d.get("id") or new_id()
         )
 
 
+class ExpenseTable:
+    """Expenses stored as parallel columns instead of a list of objects.
+
+    Scans only touch the columns they need; a full Expense is built on
+    demand when a single row is read. Row indices are also indexed by day
+    so the daily view does not have to scan every row, and spending totals
+    are kept up to date on every change so the summaries never rescan.
+
+    Dates and categories repeat a lot, so they are interned and rows that
+    share a value point at the same string object.
+    """
+
+    def __init__(self, items=()):
+        self.ids = []
+        self.dates = []
+        self.descriptions = []
+        self.categories = []
+        # whole paisa, so totals are exact integers rather than floats
+        self.amounts = array("q")
+        # amount as shown in the expense listing, formatted once per row
+        self.amount_texts = []
+        self.day_index = defaultdict(list)
+        self.index_stale = False
+        # running totals in paisa; each entry is [row count, amount] so that
+        # keys disappear once their last row is gone
+        self.total = 0
+        self.category_totals = {}
+        self.date_totals = {}
+        self.month_totals = {}
+        self.month_category_totals = {}
+        self.month_day_totals = {}
+        for exp in items:
+            self.append(exp)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return Expense(
+            date=self.dates[i],
+            description=self.descriptions[i],
+            category=self.categories[i],
+            amount=self.amounts[i] / 100,
+            id=self.ids[i]
+        )
+
+    def __setitem__(self, i, exp):
+        old = self[i]
+        # count the new values before removing the old ones so an entry
+        # that keeps its category or date also keeps its place
+        self._tally(exp, 1)
+        self._tally(old, -1)
+
+        if exp.date != old.date and not self.index_stale:
+            self.day_index[old.date].remove(i)
+            if not self.day_index[old.date]:
+                del self.day_index[old.date]
+            insort(self.day_index[exp.date], i)
+
+        self.ids[i] = exp.id
+        self.dates[i] = sys.intern(exp.date)
+        self.descriptions[i] = exp.description
+        self.categories[i] = sys.intern(exp.category)
+        self.amounts[i] = to_paisa(exp.amount)
+        self.amount_texts[i] = f"{self.amounts[i] / 100:>10.2f}"
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, exp):
+        self.ids.append(exp.id)
+        self.dates.append(sys.intern(exp.date))
+        self.descriptions.append(exp.description)
+        self.categories.append(sys.intern(exp.category))
+        self.amounts.append(to_paisa(exp.amount))
+        self.amount_texts.append(f"{self.amounts[-1] / 100:>10.2f}")
+        self._tally(exp, 1)
+        if not self.index_stale:
+            self.day_index[exp.date].append(len(self.ids) - 1)
+
+    def pop(self, i=-1):
+        exp = self[i]
+        del self.ids[i]
+        del self.dates[i]
+        del self.descriptions[i]
+        del self.categories[i]
+        del self.amounts[i]
+        del self.amount_texts[i]
+        self._tally(exp, -1)
+        # every later row shifts down by one; rebuild the indices once on
+        # the next lookup instead of after each pop of a bulk delete
+        self.index_stale = True
+        return exp
+
+    def rows_on(self, date):
+        """Row indices of the expenses recorded on a YYYY-MM-DD date"""
+        if self.index_stale:
+            self._reindex()
+        return self.day_index.get(date, [])
+
+    def total_spending(self):
+        """Amount spent over all time, in rupees"""
+        return self.total / 100
+
+    def category_spending(self, month=None):
+        """Rupees spent per category, in one YYYY-MM month or over all time"""
+        if month is None:
+            totals = self.category_totals
+        else:
+            totals = self.month_category_totals.get(month, {})
+        return {cat: amount / 100 for cat, (_, amount) in totals.items()}
+
+    def month_spending(self, month):
+        """Rupees spent in a YYYY-MM month"""
+        return self.month_totals.get(month, (0, 0))[1] / 100
+
+    def daily_spending(self, month):
+        """Rupees spent per day of month in a YYYY-MM month"""
+        totals = self.month_day_totals.get(month, {})
+        return {day: amount / 100 for day, (_, amount) in totals.items()}
+
+    def date_spending(self, date):
+        """Rupees spent on a YYYY-MM-DD date"""
+        return self.date_totals.get(date, (0, 0))[1] / 100
+
+    def _tally(self, exp, sign):
+        month = exp.date[:7]
+        paisa = to_paisa(exp.amount)
+        self.total += sign * paisa
+        self._add(self.category_totals, exp.category, paisa, sign)
+        self._add(self.date_totals, exp.date, paisa, sign)
+        self._add(self.month_totals, month, paisa, sign)
+        self._add(self.month_category_totals.setdefault(month, {}), exp.category, paisa, sign)
+        self._add(self.month_day_totals.setdefault(month, {}), int(exp.date[8:10]), paisa, sign)
+        if month not in self.month_totals:
+            del self.month_category_totals[month]
+            del self.month_day_totals[month]
+
+    @staticmethod
+    def _add(totals, key, amount, sign):
+        entry = totals.setdefault(key, [0, 0])
+        entry[0] += sign
+        entry[1] += sign * amount
+        if entry[0] == 0:
+            del totals[key]
+
+    def _reindex(self):
+        self.day_index.clear()
+        for i, date in enumerate(self.dates):
+            self.day_index[date].append(i)
+        self.index_stale = False
+
+
+# orjson is optional; it parses and serializes much faster than the stdlib json
+if orjson is not None:
+    JSON_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+else:
+    JSON_ERRORS = (json.JSONDecodeError,)
+
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# The data file is an append-only log with one JSON record per line:
+#   {"op": "add", "id": ..., "date": ..., ...}  new expense
+#   {"op": "upd", "id": ..., "date": ..., ...}  replaces the expense with that id
+#   {"op": "del", "id": ...}                    removes the expense with that id
+# Replaying the log in order gives the current list of expenses.
+log_records = 0
+
+
 def load_expenses():
+    global log_records
+
     if not os.path.exists(FILE_NAME):
+        return import_legacy_expenses()
+
+    log_records = 0
+    try:
+        with open(FILE_NAME, "rb") as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            # read lines straight from the page cache instead of copying
+            # them through the file object's buffer
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                loaded, rejected, new_ids = replay_log(iter(mm.readline, b""))
+                torn = mm[-1:] != b"\n"
+    except IOError as e:
+        print(f"Error loading expenses: {e}")
+        return []
+
+    # bad records are kept in a separate file before the log is rewritten
+    # without them; if they cannot be kept, the log is left as it is
+    if rejected and not save_rejected(rejected):
+        return loaded
+
+    # also make sure the next append starts on a fresh line even if the
+    # last write stopped just before its newline; ids given to records that
+    # had none must be saved so later del and upd records can refer to them
+    if rejected or torn or new_ids:
+        write_log(loaded)
+    return loaded
+
+
+def save_rejected(lines):
+    """Append log lines that could not be loaded to the rejected file"""
+    try:
+        with open(REJECTED_FILE_NAME, "ab") as f:
+            f.writelines(line.rstrip(b"\r\n") + b"\n" for line in lines)
+    except IOError as e:
+        print(f"Error saving rejected records: {e}")
+        return False
+    print(f"Moved {len(lines)} rejected record(s) to {REJECTED_FILE_NAME}")
+    return True
+
+
+def replay_log(lines):
+    global log_records
+
+    by_id = {}
+    rejected = []
+    new_ids = 0
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        log_records += 1
+
+        try:
+            record = json_loads(line)
+        except JSON_ERRORS:
+            record = None
+        if not isinstance(record, dict):
+            print(f"Skipping unreadable record on line {line_no} of {FILE_NAME}")
+            rejected.append(line)
+            continue
+
+        op = record.get("op", "add")
+        if op == "del":
+            exp_id = record.get("id")
+            if not isinstance(exp_id, str) or not exp_id:
+                print(f"Skipping invalid record on line {line_no} of {FILE_NAME}")
+                rejected.append(line)
+                continue
+            by_id.pop(exp_id, None)
+            continue
+
+        exp = expense_from_record(record)
+        if exp is None:
+            print(f"Skipping invalid record on line {line_no} of {FILE_NAME}")
+            rejected.append(line)
+        elif op != "upd" or exp.id in by_id:
+            by_id[exp.id] = exp
+            if not record.get("id"):
+                new_ids += 1
+
+    return list(by_id.values()), rejected, new_ids
+
+
+def expense_from_record(record):
+    """Expense for a stored record, or None if the record is malformed"""
+    try:
+        exp = Expense.from_dict(record)
+        m = LOOSE_DATE_RE.fullmatch(exp.date)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if m:
+        exp.date = "{}-{:0>2}-{:0>2}".format(*m.groups())
+    # ids are used as dict keys while replaying the log
+    if not isinstance(exp.id, str):
+        return None
+    if not isinstance(exp.description, str) or not isinstance(exp.category, str):
+        return None
+    if not valid_date(exp.date) or not math.isfinite(exp.amount):
+        return None
+    # same limits as the amount prompts, checked in paisa as the table stores
+    # them, so an amount that rounds down to nothing is rejected too
+    if not 0 < to_paisa(exp.amount) <= MAX_AMOUNT * 100:
+        return None
+    return exp
+
+
+def import_legacy_expenses():
+    """Convert an old expenses.json array file into the log format"""
+    if not os.path.exists(LEGACY_FILE_NAME):
         return []
     try:
-        with open(FILE_NAME, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return [Expense.from_dict(item) for item in data]
-    except (json.JSONDecodeError, IOError) as e:
+        with open(LEGACY_FILE_NAME, "rb") as f:
+            items = json_loads(f.read())
+    except (*JSON_ERRORS, IOError) as e:
         print(f"Error loading expenses: {e}")
         return []
 
+    loaded = []
+    for n, item in enumerate(items, start=1):
+        exp = expense_from_record(item) if isinstance(item, dict) else None
+        if exp is None:
+            print(f"Skipping invalid expense #{n} in {LEGACY_FILE_NAME}")
+        else:
+            loaded.append(exp)
 
-expenses = load_expenses()
+    write_log(loaded)
+    return loaded
 
 
+def write_log(items):
+    """Replace the log with one add record per expense"""
+    global log_records
 
-def save_expenses():
+    # write a temporary file and swap it in, so an interrupted rewrite
+    # never leaves a half-written log behind
+    tmp_name = FILE_NAME + ".tmp"
     try:
-        with open(FILE_NAME, "w", encoding="utf-8") as f:
-            json.dump([exp.to_dict() for exp in expenses], f, indent=2)
+        with open(tmp_name, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            for exp in items:
+                f.write(json_dumps({"op": "add", **exp.to_dict()}) + b"\n")
+        os.replace(tmp_name, FILE_NAME)
+        log_records = len(items)
     except IOError as e:
         print(f"Error saving expenses: {e}")
+        # the old log is still intact; only the partial copy needs removing
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+
+
+# filled by main(), so importing this module does not read the data file
+expenses = ExpenseTable()
+
+
+def compact_expenses():
+    """Rewrite the log once more than half of its records are stale"""
+    if log_records > 2 * len(expenses):
+        write_log(expenses)
+
+
+def append_record(op, exp):
+    global log_records
+
+    if op == "del":
+        record = {"op": op, "id": exp.id}
+    else:
+        record = {"op": op, **exp.to_dict()}
+
+    try:
+        with open(FILE_NAME, "ab") as f:
+            f.write(json_dumps(record) + b"\n")
+        log_records += 1
+    except IOError as e:
+        print(f"Error saving expenses: {e}")
+        return
+
+    compact_expenses()
+
+
+def no_display():
+    """True on Linux when neither an X11 nor a Wayland display is available"""
+    return (
+        sys.platform.startswith("linux")
+        and not os.environ.get("DISPLAY")
+        and not os.environ.get("WAYLAND_DISPLAY")
+    )
+
+
+def load_pyplot():
+    global plt
+    if plt is None:
+        import matplotlib
+
+        # pick Agg up front when no window can be opened, instead of letting
+        # matplotlib probe the GUI toolkits first; MPLBACKEND still wins
+        if "MPLBACKEND" not in os.environ and no_display():
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    return plt
+
+
+def opens_chart_window():
+    """True when charts are shown in a window rather than saved to a file"""
+    # asking pyplot for its backend resolves it the same way drawing would,
+    # including the fall back to Agg when no GUI toolkit can be loaded
+    return load_pyplot().get_backend().lower() not in FILE_BACKENDS
+
+
+def render_chart(plot, *args):
+    """Call a plot function with the chart data.
+
+    plt.show() blocks until its window is closed, so charts that open a
+    window are drawn in a child process and the menu stays usable in the
+    meantime. The child is a daemon: its windows close when the program
+    exits. Charts saved to files are drawn right away in this process, so
+    the "Chart saved" message comes before the next menu prompt.
+    """
+    if opens_chart_window():
+        Process(target=plot, args=args, daemon=True).start()
+    else:
+        plot(*args)
+
+
+def chart_axes(name, figsize, ncols=1):
+    """Reuse the chart figure called name if it is still open, else create it"""
+    load_pyplot()
+    # the tight layout is solved as part of each draw instead of by a
+    # separate tight_layout() pass that renders the figure once more
+    fig = plt.figure(num=name, figsize=figsize, layout="tight")
+    if len(fig.axes) == ncols:
+        for ax in fig.axes:
+            ax.clear()
+    else:
+        fig.clear()
+        fig.subplots(1, ncols)
+    return fig, fig.axes
+
+
+def draw_bars(ax, positions, heights, labels, color, edgecolor, width=0.8):
+    """Draw all bars as a single PatchCollection instead of one artist per bar"""
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import Rectangle
+
+    bars = PatchCollection(
+        [Rectangle((x - width / 2, 0), width, h) for x, h in zip(positions, heights)],
+        facecolor=color, edgecolor=edgecolor, alpha=0.7
+    )
+    ax.add_collection(bars)
+    ax.set_xlim(min(positions) - width, max(positions) + width)
+    # every stored amount is at least one paisa, so all bars are above zero
+    ax.set_ylim(0, max(heights) * 1.05)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels)
+
+
+def display_chart(fig, filename):
+    if plt.get_backend().lower() in FILE_BACKENDS:
+        os.makedirs(CHART_DIR, exist_ok=True)
+        path = os.path.join(CHART_DIR, filename)
+        fig.savefig(path, dpi=90)
+        print(f"Chart saved to {path}")
+    else:
+        # only reached in a fresh child process (see render_chart)
+        plt.show()
 
 
 def add_expense():
@@ -84,11 +584,9 @@ def add_expense():
     # get date
     while True:
         date = input("Enter the date (YYYY-MM-DD): ").strip()
-        try:
-            datetime.strptime(date, "%Y-%m-%d")
+        if valid_date(date):
             break
-        except ValueError:
-            print("Invalid input! Enter in YYYY-MM-DD format.")
+        print("Invalid input! Enter in YYYY-MM-DD format.")
 
     description = input("Enter description: ").strip()
 
@@ -100,7 +598,7 @@ def add_expense():
     while True:
         amount_str = input("Enter amount: ").strip()
         try:
-            amount = float(amount_str)
+            amount = parse_amount(amount_str)
             if amount <= 0:
                 print("Amount must be greater than 0.")
                 continue
@@ -110,7 +608,7 @@ def add_expense():
 
     expense = Expense(date=date, description=description, category=category, amount=amount)
     expenses.append(expense)
-    save_expenses()
+    append_record("add", expense)
     print("Expense added successfully!")
 
 
@@ -119,29 +617,34 @@ def view_expense_by_day():
 
     while True:
         target = input("Enter the date (YYYY-MM-DD): ").strip()
-        try:
-            datetime.strptime(target, "%Y-%m-%d")
+        if valid_date(target):
             break
-        except ValueError:
-            print("Invalid input! Enter in YYYY-MM-DD format.")
-
-    found = False
-    total = 0
+        print("Invalid input! Enter in YYYY-MM-DD format.")
 
-    print(f"\nExpenses for {target}:")
-    print("-" * 60)
+    rows = expenses.rows_on(target)
 
-    for exp in expenses:
-        if target == exp.date:
-            found = True
-            print(f"  {exp.category:<15} | {exp.description:<25} | Rs. {exp.amount:.2f}")
-            total += exp.amount
+    out = [f"\nExpenses for {target}:\n", "-" * 60 + "\n"]
+    for i in rows:
+        amount = expenses.amounts[i] / 100
+        out.append(f"  {expenses.categories[i]:<15} | {expenses.descriptions[i]:<25} | Rs. {amount:.2f}\n")
 
-    if not found:
-        print("No expenses found for this date.")
+    if not rows:
+        out.append("No expenses found for this date.\n")
     else:
-        print("-" * 60)
-        print(f"Total spending on {target}: Rs. {total:.2f}")
+        out.append("-" * 60 + "\n")
+        out.append(f"Total spending on {target}: Rs. {expenses.date_spending(target):.2f}\n")
+
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
+
+
+def summarize_month(month):
+    """Total, per-category and per-day spending for a YYYY-MM month"""
+    return (
+        expenses.month_spending(month),
+        expenses.category_spending(month),
+        expenses.daily_spending(month)
+    )
 
 
 def view_monthly_summary():
@@ -149,122 +652,105 @@ def view_monthly_summary():
 
     while True:
         month = input("Enter the month (YYYY-MM): ").strip()
-        try:
-            datetime.strptime(month, "%Y-%m")
+        if valid_month(month):
             break
-        except ValueError:
-            print("Invalid input! Enter in YYYY-MM format.")
-
-    total = 0
-    by_category = {}
-    found = False
+        print("Invalid input! Enter in YYYY-MM format.")
 
-    for exp in expenses:
-        date_str = exp.date
-        if date_str.startswith(month):
-            found = True
-            amount = exp.amount
-            total += amount
+    total, by_category, daily_totals = summarize_month(month)
 
-            cat = exp.category
-            if cat not in by_category:
-                by_category[cat] = 0
-            by_category[cat] += amount
-
-    if not found:
+    if not by_category:
         print("No expenses found for this month.")
         return
 
-    # print summary
-    print(f"\nTotal spending in {month}: Rs. {total:.2f}")
-    print("\nBy category:")
-    for cat, cat_total in by_category.items():
-        percentage = (cat_total / total) * 100
-        print(f"  {cat:<15} Rs. {cat_total:>8.2f}  ({percentage:.1f}%)")
-
-    # category chart
-    categories = list(by_category.keys())
-    amounts = list(by_category.values())
-
-    plt.figure(figsize=(10, 5))
-    plt.bar(categories, amounts, color='skyblue', edgecolor='navy', alpha=0.7)
-    plt.title(f"Spending by Category for {month}", fontsize=14, fontweight='bold')
-    plt.xlabel("Category", fontsize=12)
-    plt.ylabel("Amount Spent (Rs.)", fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.grid(axis='y', linestyle='--', alpha=0.3)
-    plt.show()
-
-    # daily spending trend
-    daily_totals = {}
-
-    for exp in expenses:
-        if exp.date.startswith(month):
-            day = int(exp.date.split("-")[2])
-            daily_totals[day] = daily_totals.get(day, 0) + exp.amount
-
-    if not daily_totals:
-        print("No daily data to plot.")
-        return
+    # print summary in one write
+    out = [f"\nTotal spending in {month}: Rs. {total:.2f}\n", "\nBy category:\n"]
+    out.extend(
+        SUMMARY_ROW(cat, cat_total, (cat_total / total) * 100 if total else 0)
+        for cat, cat_total in by_category.items()
+    )
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
 
+    # category chart and daily spending trend, side by side in one figure
     days = sorted(daily_totals.keys())
-    amounts_by_day = [daily_totals[day] for day in days]
+    render_chart(
+        plot_month_summary,
+        month,
+        list(by_category.keys()),
+        list(by_category.values()),
+        days,
+        [daily_totals[day] for day in days]
+    )
 
-    plt.figure(figsize=(12, 5))
-    plt.bar(days, amounts_by_day, color='orange', edgecolor='darkorange', alpha=0.7)
-    plt.title(f"Daily Spending Trend for {month}", fontsize=14, fontweight='bold')
-    plt.xlabel("Day of Month", fontsize=12)
-    plt.ylabel("Amount Spent (Rs.)", fontsize=12)
-    plt.xticks(days)
-    plt.grid(axis='y', linestyle='--', alpha=0.3)
-    plt.tight_layout()
-    plt.show()
 
+def plot_month_summary(month, categories, amounts, days, amounts_by_day):
+    fig, (cat_ax, day_ax) = chart_axes("month_summary", figsize=(16, 5), ncols=2)
 
-def display_expenses_list(show_chart=True):
-    """Helper function to display expenses table, optionally with chart"""
-    if not expenses:
-        print("No expenses recorded yet.")
-        return 0, {}
-
-    total = 0
-    by_category = {}
-
-    print(f"\n{'ID':<4} {'Date':<12} {'Category':<15} {'Description':<30} {'Amount (Rs.)'}")
-    print("=" * 85)
-
-    for idx, exp in enumerate(expenses, start=1):
-        print(f"{idx:<4} {exp.date:<12} {exp.category:<15} {exp.description:<30} {exp.amount:>10.2f}")
-        total += exp.amount
+    draw_bars(cat_ax, range(len(categories)), amounts, categories, 'skyblue', 'navy')
+    cat_ax.set_title(f"Spending by Category for {month}", fontsize=14, fontweight='bold')
+    cat_ax.set_xlabel("Category", fontsize=12)
+    cat_ax.set_ylabel("Amount Spent (Rs.)", fontsize=12)
+    plt.setp(cat_ax.get_xticklabels(), rotation=45, ha='right')
+    cat_ax.grid(axis='y', linestyle='--', alpha=0.3)
 
-        cat = exp.category
-        by_category[cat] = by_category.get(cat, 0) + exp.amount
+    draw_bars(day_ax, days, amounts_by_day, days, 'orange', 'darkorange')
+    day_ax.set_title(f"Daily Spending Trend for {month}", fontsize=14, fontweight='bold')
+    day_ax.set_xlabel("Day of Month", fontsize=12)
+    day_ax.set_ylabel("Amount Spent (Rs.)", fontsize=12)
+    day_ax.grid(axis='y', linestyle='--', alpha=0.3)
 
-    print("=" * 85)
-    print(f"{'TOTAL':<61} Rs. {total:>10.2f}")
+    display_chart(fig, f"summary_{month}.png")
 
-    # show chart if needed
-    if show_chart and by_category:
-        categories = list(by_category.keys())
-        amounts = list(by_category.values())
 
-        plt.figure(figsize=(10, 5))
-        plt.bar(categories, amounts, color='lightgreen', edgecolor='darkgreen', alpha=0.7)
-        plt.title("Total Spending by Category (All Time)", fontsize=14, fontweight='bold')
-        plt.xlabel("Category", fontsize=12)
-        plt.ylabel("Amount Spent (Rs.)", fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.tight_layout()
-        plt.show()
+def list_expenses_text():
+    """Print the table of all expenses with the grand total"""
+    if not expenses:
+        print("No expenses recorded yet.")
+        return
 
-    return total, by_category
+    # build the whole table first and write it in one go
+    out = [
+        f"\n{'ID':<4} {'Date':<12} {'Category':<15} {'Description':<30} {'Amount (Rs.)'}\n",
+        "=" * 85 + "\n"
+    ]
+
+    out.extend(map(
+        LISTING_ROW,
+        range(1, len(expenses) + 1),
+        expenses.dates,
+        expenses.categories,
+        expenses.descriptions,
+        expenses.amount_texts
+    ))
+
+    out.append("=" * 85 + "\n")
+    out.append(f"{'TOTAL':<61} Rs. {expenses.total_spending():>10.2f}\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
+
+
+def plot_all_expenses():
+    """Chart the all-time spending per category"""
+    by_category = expenses.category_spending()
+    if by_category:
+        render_chart(plot_categories, list(by_category.keys()), list(by_category.values()))
+
+
+def plot_categories(categories, amounts):
+    fig, (ax,) = chart_axes("all_categories", figsize=(10, 5))
+    draw_bars(ax, range(len(categories)), amounts, categories, 'lightgreen', 'darkgreen')
+    ax.set_title("Total Spending by Category (All Time)", fontsize=14, fontweight='bold')
+    ax.set_xlabel("Category", fontsize=12)
+    ax.set_ylabel("Amount Spent (Rs.)", fontsize=12)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.grid(axis='y', linestyle='--', alpha=0.3)
+    display_chart(fig, "summary_all_time.png")
 
 
 def view_all_expenses():
     print("\n--- All Expenses ---")
-    display_expenses_list(show_chart=True)
+    list_expenses_text()
+    plot_all_expenses()
 
 
 def delete_expense():
@@ -275,7 +761,7 @@ def delete_expense():
         return
 
     while True:
-        display_expenses_list(show_chart=False)
+        list_expenses_text()
 
         choice = input("\nEnter the ID of the expense to delete (or press Enter to cancel): ").strip()
 
@@ -301,7 +787,7 @@ def delete_expense():
                 print("Delete skipped.")
             else:
                 deleted = expenses.pop(idx - 1)
-                save_expenses()
+                append_record("del", deleted)
                 print(f"Deleted: {deleted.date} | {deleted.category} | {deleted.description} | Rs. {deleted.amount:.2f}")
 
             if not expenses:
@@ -324,7 +810,7 @@ def update_expense():
         print("No expenses recorded yet.")
         return
 
-    display_expenses_list(show_chart=False)
+    list_expenses_text()
 
     while True:
         choice = input("\nEnter the ID of the expense to update (or press Enter to cancel): ").strip()
@@ -341,6 +827,7 @@ def update_expense():
 
         if 1 <= idx <= len(expenses):
             exp = expenses[idx - 1]
+            original = expenses[idx - 1]
             break
         else:
             print(f"Please enter a number between 1 and {len(expenses)}.")
@@ -352,12 +839,10 @@ def update_expense():
         new_date = input(f"New date [{exp.date}] (YYYY-MM-DD): ").strip()
         if new_date == "":
             break
-        try:
-            datetime.strptime(new_date, "%Y-%m-%d")
+        if valid_date(new_date):
             exp.date = new_date
             break
-        except ValueError:
-            print("Invalid date format! Please enter as YYYY-MM-DD.")
+        print("Invalid date format! Please enter as YYYY-MM-DD.")
 
     # update description
     new_desc = input(f"New description [{exp.description}]: ").strip()
@@ -376,7 +861,7 @@ def update_expense():
             break
 
         try:
-            new_amount = float(new_amount_str)
+            new_amount = parse_amount(new_amount_str)
             if new_amount <= 0:
                 print("Amount must be greater than 0.")
                 continue
@@ -385,11 +870,19 @@ def update_expense():
         except ValueError:
             print("Invalid amount, please enter a number.")
 
-    save_expenses()
+    # skip the log write when every field was kept
+    if exp == original:
+        print("No changes made.")
+        return
+
+    expenses[idx - 1] = exp
+    append_record("upd", exp)
     print("Expense updated successfully!")
 
 
 def export_to_csv():
+    import csv
+
     print("\n--- Export to CSV ---")
 
     if not expenses:
@@ -397,17 +890,15 @@ def export_to_csv():
         return
 
     try:
-        with open(CSV_EXPORT_NAME, "w", newline="", encoding="utf-8") as file:
+        with open(CSV_EXPORT_NAME, "w", newline="", encoding="utf-8",
+                  buffering=CSV_BUFFER_SIZE) as file:
             writer = csv.writer(file)
             writer.writerow(["Date", "Description", "Category", "Amount (Rs.)"])
 
-            for exp in expenses:
-                writer.writerow([
-                    exp.date,
-                    exp.description,
-                    exp.category,
-                    f"{exp.amount:.2f}"
-                ])
+            rows = zip(expenses.dates, expenses.descriptions, expenses.categories, expenses.amounts)
+            writer.writerows(
+                (date, desc, cat, f"{amount / 100:.2f}") for date, desc, cat, amount in rows
+            )
 
         print(f"Expenses successfully exported to {CSV_EXPORT_NAME}")
     except IOError as e:
@@ -415,6 +906,9 @@ def export_to_csv():
 
 
 def main():
+    global expenses
+    expenses = ExpenseTable(load_expenses())
+
     while True:
         print("\n" + "=" * 50)
         print("           PERSONAL EXPENSE TRACKER")